@@ -8,12 +8,12 @@ import os
 import sys
 import json
 import logging
-from datetime import datetime, timezone
+import numpy as np
 from fastmcp import FastMCP
-from skyfield.api import Loader, Topos, Star
+from skyfield.api import Loader, Topos, Star, wgs84
 from skyfield.data import hipparcos
-import convertdate
-from convertdate import mayan, julian
+from src.temporal import calendars
+from src.physics.sites import coordinate_count, parse_coordinates, validate_sites
 
 # Configure logging to stderr
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', stream=sys.stderr)
@@ -42,39 +42,21 @@ try:
 except FileNotFoundError:
     logger.warning("cultural_library.json not found. Using empty library.")
 
+# Upper bound on observer sites evaluated by a single grid call
+MAX_GRID_SITES = 100000
+
 
 def parse_ancient_date(date_str: str):
     """
     Parses date strings with prefixes:
     M:b,k,t,u,k -> Mayan Long Count
     J:y,m,d -> Julian Calendar
+    E:y,m,d -> Egyptian Civil Calendar
     ISO -> Gregorian
     Returns: Time object from Skyfield (Julian Day)
     """
-    date_str = date_str.strip()
-    
     try:
-        if date_str.startswith("M:"):
-            # Mayan: M:13,0,0,0,0
-            parts = [int(x) for x in date_str[2:].split(',')]
-            if len(parts) != 5:
-                raise ValueError("Mayan date requires 5 components (b,k,t,u,k)")
-            jd = mayan.to_jd(*parts)
-            return ts.jd(jd)
-
-        elif date_str.startswith("J:"):
-            # Julian: J:200,1,1
-            parts = [int(x) for x in date_str[2:].split(',')]
-            if len(parts) != 3:
-                raise ValueError("Julian date requires 3 components (y,m,d)")
-            jd = julian.to_jd(*parts)
-            return ts.jd(jd)
-        
-        else:
-            # Try ISO format (Gregorian)
-            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return ts.from_datetime(dt)
-
+        return ts.ut1_jd(calendars.parse_date_string(date_str))
     except Exception as e:
         logger.error(f"Date parsing error: {e}")
         raise ValueError(f"Invalid date format: {e}")
@@ -136,5 +118,75 @@ Scientific Data:
     except Exception as e:
         return f"Error: {str(e)}"
 
+@mcp.tool()
+def convert_culture_to_coordinates_grid(culture_id: str = "", object_names: str = "", date_str: str = "", lats: str = "0", lons: str = "0", grid: bool = False) -> str:
+    """Evaluates cultural objects for many observer sites at one date. Returns CSV of topocentric RA/Dec and Alt/Az.
+    object_names: comma-separated. lats/lons (degrees, |lat| <= 90, |lon| <= 180): 'a,b,c' or 'start:stop:step'. grid=True pairs every lat with every lon, otherwise lats/lons are zipped."""
+    if not culture_id or not object_names or not date_str:
+        return "Error: culture_id, object_names, and date_str are required"
+
+    try:
+        # 1. Lookup Objects
+        culture_data = CULTURAL_LIBRARY.get(culture_id)
+        if not culture_data:
+            return f"Error: Culture '{culture_id}' not found"
+
+        objects = []
+        for name in (n.strip() for n in object_names.split(",") if n.strip()):
+            obj_data = culture_data.get("objects", {}).get(name)
+            if not obj_data:
+                return f"Error: Object '{name}' not found in culture '{culture_id}'"
+            objects.append((name, obj_data.get("modern_id")))
+
+        # 2. Build Sites (sizes are checked before any array is allocated)
+        n_lat, n_lon = coordinate_count(lats), coordinate_count(lons)
+        if not grid and n_lat != n_lon:
+            return "Error: lats and lons must have the same length unless grid=True"
+        n_sites = n_lat * n_lon if grid else n_lat
+        if not 0 < n_sites <= MAX_GRID_SITES:
+            return f"Error: Site count must be between 1 and {MAX_GRID_SITES}"
+
+        lat_arr, lon_arr = parse_coordinates(lats), parse_coordinates(lons)
+        validate_sites(lat_arr, lon_arr)
+        if grid:
+            lat_arr, lon_arr = (a.ravel() for a in np.meshgrid(lat_arr, lon_arr, indexing="ij"))
+
+        # 3. Parse Date
+        t = parse_ancient_date(date_str)
+
+        # 4. Earth/body state once per date, broadcast over all sites
+        sites = wgs84.latlon(lat_arr, lon_arr)
+        site_xyz = sites.at(t).position.au
+        rotation = sites.rotation_at(t)
+        earth_at = earth.at(t)
+
+        lines = [
+            f"Success: {len(objects)} object(s) x {len(lat_arr)} site(s)",
+            f"- Date (UTC): {t.utc_iso()}",
+            f"- Julian Day: {t.tt:.4f}",
+            "",
+            "object,lat,lon,ra_hours,dec_degrees,alt_degrees,az_degrees"
+        ]
+        for name, modern_id in objects:
+            geocentric = earth_at.observe(planets[modern_id])
+            astrometric = geocentric.position.au[:, None] - site_xyz
+            apparent = geocentric.apparent().position.au[:, None] - site_xyz
+
+            x, y, z = astrometric
+            ra = np.degrees(np.arctan2(y, x)) % 360.0 / 15.0
+            dec = np.degrees(np.arctan2(z, np.hypot(x, y)))
+
+            north, east, up = np.einsum("ijn,jn->in", rotation, apparent)
+            alt = np.degrees(np.arctan2(up, np.hypot(north, east)))
+            az = np.degrees(np.arctan2(east, north)) % 360.0
+
+            for row in zip(lat_arr, lon_arr, ra, dec, alt, az):
+                lines.append(f"{name},{row[0]:.4f},{row[1]:.4f},{row[2]:.6f},{row[3]:.5f},{row[4]:.4f},{row[5]:.4f}")
+
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
 if __name__ == "__main__":
     mcp.run()
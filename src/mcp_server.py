@@ -4,11 +4,17 @@ import os
 # Add project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
 import json
-from typing import Dict, Any, List, Optional
+import base64
+import anyio
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from src.temporal.broker import TemporalBroker
 from src.physics.engine import PhysicsEngine
+from src.physics.sites import validate_sites
+from src.model.library import CulturalLibrary
 
 # Initialize MCP Server
 mcp = FastMCP("Sky Culture Engine")
@@ -23,76 +29,193 @@ broker = TemporalBroker()
 CATALOG_PATH = os.getenv("HIP_CATALOG_PATH", os.path.join(DATA_DIR, "hip_main.dat"))
 engine = PhysicsEngine(hip_csv_path=CATALOG_PATH)
 
-def load_library():
+def load_library() -> CulturalLibrary:
     if os.path.exists(ENRICHED_LIB_PATH):
-        with open(ENRICHED_LIB_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+        return CulturalLibrary.load(ENRICHED_LIB_PATH)
+    return CulturalLibrary()
 
 CULTURAL_LIBRARY = load_library()
 
+# Upper bound on dates evaluated by a single run_sky_query sweep
+MAX_SWEEP_STEPS = 1000
+
+def _sweep_jdns(jdn: Any, step_days: float) -> List[float]:
+    """Expands a broker result (single JDN or (start, end) range) into a list of JDNs."""
+    if not isinstance(jdn, tuple):
+        return [float(jdn)]
+
+    start, end = jdn
+    if step_days <= 0:
+        raise ValueError("step_days must be positive")
+    if end < start:
+        raise ValueError("Date range end is before start")
+    steps = int((end - start) // step_days) + 1
+    if steps > MAX_SWEEP_STEPS:
+        raise ValueError(f"Date range yields {steps} steps (max {MAX_SWEEP_STEPS}); increase step_days")
+    return [start + i * step_days for i in range(steps)]
+
+# Dates per get_star_altaz batch; progress is reported after each batch
+SWEEP_CHUNK_STEPS = 100
+
+# Result sets held for cursor pagination (least recently used evicted first)
+MAX_CACHED_RESULTS = 64
+_RESULT_CACHE: "OrderedDict[str, Tuple[str, List[Any]]]" = OrderedDict()
+
+def _encode_cursor(token: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{token}:{offset}".encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        token, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        offset = int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return token, offset
+
+def _paginate(kind: str, cursor: str, page_size: str, compute: Callable[[], List[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns one page of a result set and the cursor for the next page (None on the last page).
+    The full result set is computed once and cached, so following cursors never recomputes it.
+    """
+    size = int(page_size)
+    if size < 1:
+        raise ValueError("page_size must be positive")
+
+    token = None
+    if cursor:
+        token, offset = _decode_cursor(cursor)
+        try:
+            entry = _RESULT_CACHE[token]
+            _RESULT_CACHE.move_to_end(token)
+        except KeyError:
+            # Evicted (possibly by a concurrent call) or never issued
+            raise ValueError("Cursor expired or does not belong to this query")
+        if entry[0] != kind:
+            raise ValueError("Cursor expired or does not belong to this query")
+        items = entry[1]
+        if offset > len(items):
+            raise ValueError("Invalid cursor")
+    else:
+        items, offset = compute(), 0
+
+    end = offset + size
+    if end >= len(items):
+        return items[offset:], None
+
+    if token is None:
+        token = uuid.uuid4().hex
+        _RESULT_CACHE[token] = (kind, items)
+        while len(_RESULT_CACHE) > MAX_CACHED_RESULTS:
+            _RESULT_CACHE.popitem(last=False)
+    return items[offset:end], _encode_cursor(token, end)
+
+def _star_j2000_list(hip_ids: List[int]) -> List[Dict[str, Any]]:
+    stars = []
+    for hid in hip_ids:
+        coords = engine.get_star_j2000(hid)
+        stars.append(coords if "error" not in coords else {"hip": hid, "error": coords["error"]})
+    return stars
+
+def _sweep_chunk(hip_ids: List[int], chunk: List[float], lat: float, lon: float) -> Tuple[Optional[str], Dict[int, Dict[str, List[float]]]]:
+    """Computes one batch of a sweep; returns (error, {hip: {"alt_degrees": [...], "az_degrees": [...]}})."""
+    positions = engine.get_star_altaz(hip_ids, chunk, lat, lon)
+    if "error" in positions:
+        return positions["error"], {}
+
+    partial = {}
+    for row, hid in enumerate(positions["hip"]):
+        alt = [round(float(a), 4) for a in positions["alt_degrees"][row]]
+        az = [round(float(a), 4) for a in positions["az_degrees"][row]]
+        partial[hid] = {"alt_degrees": alt, "az_degrees": az}
+    return None, partial
+
+def _parse_date_input(date_json: str) -> Any:
+    """
+    Decodes a tool's date argument: JSON objects/lists ('{"year": ...}', '[...]') are
+    parsed, anything else is passed through as a date string ('J:-500,3,21', ISO).
+    """
+    date_json = date_json.strip()
+    if not date_json:
+        raise ValueError("date_json string is required")
+    return json.loads(date_json) if date_json[0] in "{[" else date_json
+
+def _more_footer(next_cursor: Optional[str]) -> str:
+    return f"\n➡️ More results available. cursor: {next_cursor}" if next_cursor else ""
+
 @mcp.tool()
-def list_cultures() -> str:
-    """Returns a newline-separated list of all available sky culture IDs."""
-    keys = list(CULTURAL_LIBRARY.keys())
-    return "✅ Available Cultures:\n" + "\n".join(keys)
+def list_cultures(cursor: str = "", page_size: str = "100") -> str:
+    """Returns a newline-separated list of sky culture IDs. Pass the returned cursor to get the next page."""
+    try:
+        keys, next_cursor = _paginate("cultures", cursor, page_size, lambda: list(CULTURAL_LIBRARY.keys()))
+    except ValueError as e:
+        return f"❌ Error: {str(e)}"
+    return "✅ Available Cultures:\n" + "\n".join(keys) + _more_footer(next_cursor)
 
 @mcp.tool()
-def get_culture_details(culture_id: str = "") -> str:
-    """Returns the full JSON details for a specific culture as a string."""
+def get_culture_details(culture_id: str = "", cursor: str = "", page_size: str = "50") -> str:
+    """Returns the JSON details for a specific culture, paging its constellations. Follow 'next_cursor' for more."""
     if not culture_id:
         return "❌ Error: culture_id is required"
     
     data = CULTURAL_LIBRARY.get(culture_id)
     if not data:
         return f"❌ Error: Culture '{culture_id}' not found"
-        
-    return json.dumps(data, indent=2, ensure_ascii=False)
+
+    try:
+        page, next_cursor = _paginate(f"details:{culture_id}", cursor, page_size, lambda: list(data.constellations))
+    except ValueError as e:
+        return f"❌ Error: {str(e)}"
+
+    details = data.to_dict(CULTURAL_LIBRARY.stars, page)
+    if next_cursor:
+        details["next_cursor"] = next_cursor
+    return json.dumps(details, indent=2, ensure_ascii=False)
 
 @mcp.tool()
-def search_cultural_object(query: str = "") -> str:
-    """Searches for stars or constellations by name across all cultures and returns coordinates."""
+def search_cultural_object(query: str = "", cursor: str = "", page_size: str = "20") -> str:
+    """Searches for constellations by name across all cultures. Pass the same query with the returned cursor to get the next page."""
     if not query:
         return "❌ Error: query string is required"
     
     query = query.lower()
-    results = []
-    
-    for cult_id, data in CULTURAL_LIBRARY.items():
-        for const in data.get("constellations", []):
-            # Check constellation names
-            c_name = const.get("name", "").lower()
-            c_eng = const.get("common_name", {}).get("english", "").lower()
-            
-            if query in c_name or query in c_eng:
-                results.append(f"🌌 Constellation: {const.get('name')} ({cult_id})")
-                
-            # Check stars within constellation
-            for star in const.get("stars_enriched", []):
-                # star is a dict with hip, ra, dec
-                # We don't have star names in the enriched star object (only HIP), 
-                # but if the query matches the culture definition we might find it.
-                # Currently simple HIP mapping.
-                pass
+
+    def search() -> List[str]:
+        results = []
+        for cult_id, const in CULTURAL_LIBRARY.iter_constellations():
+            # Check constellation names (pre-lowered native/english names)
+            if any(query in n for n in const.search_names):
+                results.append(f"🌌 Constellation: {const.name} ({cult_id})")
+        return results
+
+    try:
+        results, next_cursor = _paginate(f"search:{query}", cursor, page_size, search)
+    except ValueError as e:
+        return f"❌ Error: {str(e)}"
 
     if not results:
         return f"⚠️ No results found for '{query}'"
         
-    return "✅ Search Results:\n" + "\n".join(results[:20])
+    return "✅ Search Results:\n" + "\n".join(results) + _more_footer(next_cursor)
 
 @mcp.tool()
 def convert_date(date_json: str = "", culture: str = "gregorian") -> str:
-    """Converts a JSON date string to Julian Day Number (JDN). Format: '{"year": 2023, ...}'"""
-    if not date_json:
+    """Converts a date to Julian Day Number (JDN). Formats: '{"year": 2023, ...}', 'J:200,1,1', 'M:13,0,0,0,0',
+    or a JSON list of either to convert many dates at once."""
+    if not isinstance(date_json, str):
+        return "❌ Error: date_json must be a JSON string"
+    if not date_json.strip():
         return "❌ Error: date_json string is required"
         
     try:
-        if isinstance(date_json, str):
-            date_dict = json.loads(date_json)
-        else:
-            return "❌ Error: date_json must be a JSON string"
-            
-        jdn = broker.to_jdn(date_dict, culture)
+        date_input = _parse_date_input(date_json)
+
+        if isinstance(date_input, list):
+            jdns = broker.to_jdn_bulk(date_input, culture)
+            return "✅ JDN:\n" + "\n".join(str(j) for j in jdns)
+
+        jdn = broker.to_jdn(date_input, culture)
         return f"✅ JDN: {jdn}"
     except Exception as e:
         return f"❌ Error: {str(e)}"
@@ -112,6 +235,69 @@ def get_star_coordinates(hip_id: str = "") -> str:
     except ValueError:
         return f"❌ Error: Invalid HIP ID '{hip_id}'"
 
+@mcp.tool()
+async def run_sky_query(culture_id: str = "", constellation: str = "", date_json: str = "", culture: str = "gregorian",
+                        step_days: str = "1", lat: str = "0", lon: str = "0", ctx: Context = None) -> str:
+    """
+    Runs culture lookup, date conversion and star positions in one call and returns JSON.
+    date_json is a broker date ('{"year": -500, "month": 3, "day": 21}') or a range
+    ('{"start": {...}, "end": {...}}') swept every step_days; culture names its calendar as in convert_date.
+    Date strings ('J:-500,3,21') are accepted too. lat/lon give the observing site in degrees.
+    Long sweeps report progress, with each batch's partial positions as the progress message.
+    """
+    if not culture_id or not constellation or not date_json:
+        return "❌ Error: culture_id, constellation, and date_json are required"
+
+    culture_data = CULTURAL_LIBRARY.get(culture_id)
+    if not culture_data:
+        return f"❌ Error: Culture '{culture_id}' not found"
+
+    const = culture_data.find_constellation(constellation)
+    if not const:
+        return f"❌ Error: Constellation '{constellation}' not found in culture '{culture_id}'"
+
+    try:
+        jdns = _sweep_jdns(broker.to_jdn(_parse_date_input(date_json), culture), float(step_days))
+        site_lat, site_lon = float(lat), float(lon)
+        validate_sites(site_lat, site_lon)
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+    # CPU-bound work runs in worker threads so the event loop keeps serving
+    # other requests and cancellation between batches
+    hip_ids = const.hip_ids(CULTURAL_LIBRARY.stars)
+    stars = await anyio.to_thread.run_sync(_star_j2000_list, hip_ids)
+
+    error = None
+    for start in range(0, len(jdns), SWEEP_CHUNK_STEPS):
+        chunk = jdns[start:start + SWEEP_CHUNK_STEPS]
+        error, partial = await anyio.to_thread.run_sync(_sweep_chunk, hip_ids, chunk, site_lat, site_lon)
+        if error:
+            break
+
+        for star in stars:
+            if star["hip"] in partial:
+                star.setdefault("alt_degrees", []).extend(partial[star["hip"]]["alt_degrees"])
+                star.setdefault("az_degrees", []).extend(partial[star["hip"]]["az_degrees"])
+
+        if ctx is not None:
+            message = json.dumps({"jdn": chunk, "stars": partial})
+            await ctx.report_progress(start + len(chunk), len(jdns), message)
+
+    result = {
+        "culture_id": culture_id,
+        "constellation": {key: getattr(const, key) for key in ("id", "name", "english_name", "native_name")},
+        "lines": const.lines(CULTURAL_LIBRARY.stars),
+        "site": {"lat": site_lat, "lon": site_lon},
+        "culture": culture,
+        "jdn": jdns,
+        "stars": stars
+    }
+    if error:
+        result["error"] = error
+
+    return await anyio.to_thread.run_sync(lambda: json.dumps(result, indent=2, ensure_ascii=False))
+
 @mcp.tool()
 def generate_stellarium_script(culture_id: str = "") -> str:
     """Returns the path to a generated Stellarium script for the given culture."""
@@ -0,0 +1,246 @@
+import json
+import sys
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+import numpy as np
+from skyfield.units import Angle
+
+class StarTable:
+    """
+    Shared, array-backed store for every HIP star referenced by the library.
+    Each star occupies one row; constellations refer to stars by row index.
+    Missing coordinates are NaN, with the enrichment error kept per row.
+    """
+
+    __slots__ = ("hip", "ra_hours", "dec_degrees", "errors", "_rows")
+
+    def __init__(self):
+        self.hip = np.empty(0, dtype=np.int32)
+        self.ra_hours = np.empty(0, dtype=np.float64)
+        self.dec_degrees = np.empty(0, dtype=np.float64)
+        self.errors: List[Optional[str]] = []
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.hip)
+
+    def row(self, hip_id: int) -> Optional[int]:
+        return self._rows.get(hip_id)
+
+    def star_dict(self, row: int) -> Dict[str, Any]:
+        """Rebuilds the enriched star entry ({hip, ra_hours, ...} or {hip, error})."""
+        hip_id = int(self.hip[row])
+        if self.errors[row] is not None or np.isnan(self.ra_hours[row]):
+            return {"hip": hip_id, "error": self.errors[row] or "Coordinates unavailable"}
+
+        ra_hours = float(self.ra_hours[row])
+        dec_degrees = float(self.dec_degrees[row])
+        return {
+            "hip": hip_id,
+            "ra_hours": ra_hours,
+            "dec_degrees": dec_degrees,
+            "ra_str": str(Angle(hours=ra_hours)),
+            "dec_str": str(Angle(degrees=dec_degrees))
+        }
+
+class _StarTableBuilder:
+    """Collects star rows while parsing, then freezes them into a StarTable."""
+
+    def __init__(self):
+        self.hip: List[int] = []
+        self.ra_hours: List[float] = []
+        self.dec_degrees: List[float] = []
+        self.errors: List[Optional[str]] = []
+        self.rows: Dict[int, int] = {}
+
+    def row(self, hip_id: int) -> int:
+        row = self.rows.get(hip_id)
+        if row is None:
+            row = self.rows[hip_id] = len(self.hip)
+            self.hip.append(hip_id)
+            self.ra_hours.append(np.nan)
+            self.dec_degrees.append(np.nan)
+            self.errors.append(None)
+        return row
+
+    def set_coordinates(self, star: Dict[str, Any]):
+        row = self.row(int(star["hip"]))
+        if "error" in star:
+            self.errors[row] = sys.intern(star["error"])
+        else:
+            self.ra_hours[row] = star["ra_hours"]
+            self.dec_degrees[row] = star["dec_degrees"]
+            self.errors[row] = None
+
+    def build(self) -> StarTable:
+        table = StarTable()
+        table.hip = np.array(self.hip, dtype=np.int32)
+        table.ra_hours = np.array(self.ra_hours, dtype=np.float64)
+        table.dec_degrees = np.array(self.dec_degrees, dtype=np.float64)
+        table.errors = self.errors
+        table._rows = self.rows
+        return table
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _split_ids(items: List[Any], stars: _StarTableBuilder) -> Tuple[List[int], Tuple[Tuple[int, Any], ...]]:
+    """
+    Splits a list of HIP IDs into star rows and the non-ID entries (e.g. "thin"),
+    which are kept as (position, value) so the original list can be rebuilt.
+    """
+    rows: List[int] = []
+    extras = []
+    for pos, item in enumerate(items):
+        try:
+            rows.append(stars.row(int(item)))
+        except (TypeError, ValueError):
+            extras.append((pos, _intern(item)))
+    return rows, tuple(extras)
+
+def _merge_ids(hips: List[Any], extras: Tuple[Tuple[int, Any], ...]) -> List[Any]:
+    """Inverse of _split_ids: reinserts the non-ID entries at their positions."""
+    for pos, item in extras:
+        hips.insert(pos, item)
+    return hips
+
+class Constellation:
+    """
+    A constellation whose stars and line polylines are int32 row indices into
+    the shared StarTable. Lines are stored flat with offsets. Entries that are
+    not HIP IDs (style markers such as "thin" or "bold") are kept separately
+    with their positions rather than failing the load.
+    """
+
+    __slots__ = ("id", "name", "english_name", "native_name", "pronounce",
+                 "star_rows", "star_extras", "line_rows", "line_offsets", "line_extras", "enriched", "search_names")
+
+    def __init__(self, data: Dict[str, Any], stars: _StarTableBuilder):
+        self.id = _intern(data.get("id"))
+        self.name = _intern(data.get("name", ""))
+        self.english_name = _intern(data.get("english_name", ""))
+        self.native_name = _intern(data.get("native_name", ""))
+        self.pronounce = _intern(data.get("pronounce", ""))
+        star_rows, self.star_extras = _split_ids(data.get("stars", []), stars)
+        self.star_rows = np.array(star_rows, dtype=np.int32)
+
+        flat: List[int] = []
+        offsets = [0]
+        line_extras = []
+        for line in data.get("lines", []):
+            rows, extras = _split_ids(line, stars)
+            flat.extend(rows)
+            offsets.append(len(flat))
+            line_extras.append(extras)
+        self.line_rows = np.array(flat, dtype=np.int32)
+        self.line_offsets = np.array(offsets, dtype=np.int32)
+        self.line_extras = tuple(line_extras)
+
+        self.enriched = "stars_enriched" in data
+        for star in data.get("stars_enriched", []):
+            stars.set_coordinates(star)
+
+        self.search_names = tuple({n.lower() for n in (self.name, self.english_name) if n})
+
+    def matches(self, name: str) -> bool:
+        """Exact, case-insensitive match on id, name, english_name or native_name."""
+        name = name.strip().lower()
+        return any((v or "").lower() == name for v in (self.id, self.name, self.english_name, self.native_name))
+
+    def hip_ids(self, stars: StarTable) -> List[int]:
+        """The constellation's HIP IDs (non-ID entries skipped)."""
+        return stars.hip[self.star_rows].tolist()
+
+    def lines(self, stars: StarTable) -> List[List[Any]]:
+        """Rebuilds the polylines as lists of HIP IDs, with style markers in place."""
+        hips = stars.hip[self.line_rows].tolist()
+        return [_merge_ids(hips[self.line_offsets[i]:self.line_offsets[i + 1]], extras)
+                for i, extras in enumerate(self.line_extras)]
+
+    def to_dict(self, stars: StarTable) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "english_name": self.english_name,
+            "native_name": self.native_name,
+            "pronounce": self.pronounce,
+            "stars": _merge_ids(self.hip_ids(stars), self.star_extras),
+            "lines": self.lines(stars)
+        }
+        if self.enriched:
+            data["stars_enriched"] = [stars.star_dict(row) for row in self.star_rows.tolist()]
+        return data
+
+class Culture:
+    """A sky culture and its constellations."""
+
+    __slots__ = ("culture_id", "region", "classification", "constellations")
+
+    def __init__(self, culture_id: str, data: Dict[str, Any], stars: _StarTableBuilder):
+        self.culture_id = sys.intern(data.get("culture_id", culture_id))
+        self.region = _intern(data.get("region", "Unknown"))
+        self.classification = tuple(_intern(c) for c in data.get("classification", []))
+        self.constellations = tuple(Constellation(c, stars) for c in data.get("constellations", []))
+
+    def find_constellation(self, name: str) -> Optional[Constellation]:
+        for const in self.constellations:
+            if const.matches(name):
+                return const
+        return None
+
+    def to_dict(self, stars: StarTable, constellations: Optional[List[Constellation]] = None) -> Dict[str, Any]:
+        """Serializes the culture; pass a subset of constellations to serialize one page."""
+        if constellations is None:
+            constellations = self.constellations
+        return {
+            "culture_id": self.culture_id,
+            "region": self.region,
+            "classification": list(self.classification),
+            "constellations": [c.to_dict(stars) for c in constellations]
+        }
+
+class CulturalLibrary:
+    """
+    In-memory model of the (enriched) cultural library.
+    Behaves like a read-only mapping of culture_id -> Culture.
+    """
+
+    __slots__ = ("cultures", "stars")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        builder = _StarTableBuilder()
+        self.cultures: Dict[str, Culture] = {
+            sys.intern(cid): Culture(cid, info, builder) for cid, info in (data or {}).items()
+        }
+        self.stars = builder.build()
+
+    @classmethod
+    def load(cls, path: str) -> "CulturalLibrary":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.cultures)
+
+    def __contains__(self, culture_id: str) -> bool:
+        return culture_id in self.cultures
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.cultures)
+
+    def keys(self):
+        return self.cultures.keys()
+
+    def items(self):
+        return self.cultures.items()
+
+    def get(self, culture_id: str) -> Optional[Culture]:
+        return self.cultures.get(culture_id)
+
+    def iter_constellations(self) -> Iterator[Tuple[str, Constellation]]:
+        for culture_id, culture in self.cultures.items():
+            for const in culture.constellations:
+                yield culture_id, const
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {cid: culture.to_dict(self.stars) for cid, culture in self.cultures.items()}
@@ -1,8 +1,42 @@
 from skyfield.api import Star, load
 from skyfield.data import hipparcos
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, List, Sequence
+
+# Bundled subset of the Hipparcos catalog holding only the stars referenced by the
+# cultural library, built by src/processing/star_subset.py
+DEFAULT_SUBSET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "hip_subset.npy")
+
+# Record layout of the bundled subset (columns of skyfield's hipparcos dataframe)
+SUBSET_DTYPE = np.dtype([
+    ("hip", "<i4"),
+    ("magnitude", "<f8"),
+    ("ra_degrees", "<f8"),
+    ("dec_degrees", "<f8"),
+    ("parallax_mas", "<f8"),
+    ("ra_mas_per_year", "<f8"),
+    ("dec_mas_per_year", "<f8"),
+])
+
+def load_hipparcos_dataframe(path: str) -> pd.DataFrame:
+    """
+    Loads a Hipparcos catalog file into skyfield's hipparcos dataframe layout.
+    Accepts the original catalog (I/239 hip_main.dat, pipe-separated) and the
+    2007 new reduction (I/311 hip2.dat, whitespace-separated, radians, Hp magnitude).
+    """
+    with load.open(path) as f:
+        if f.read(1) == b"H":
+            return hipparcos.load_dataframe(f)
+
+    # I/311 columns: HIP Sn So Nc RArad DErad Plx pmRA pmDE ... Hpmag (field 20)
+    df = pd.read_csv(path, sep=r"\s+", header=None, usecols=[0, 4, 5, 6, 7, 8, 19],
+                     names=["hip", "ra_rad", "dec_rad", "parallax_mas", "ra_mas_per_year", "dec_mas_per_year", "magnitude"])
+    df = df.assign(ra_degrees=np.degrees(df["ra_rad"]), dec_degrees=np.degrees(df["dec_rad"]))
+    df = df[["hip", "magnitude", "ra_degrees", "dec_degrees", "parallax_mas", "ra_mas_per_year", "dec_mas_per_year"]]
+    df = df.assign(ra_hours=df["ra_degrees"] / 15.0, epoch_year=1991.25)
+    return df.set_index("hip")
 
 class PhysicsEngine:
     """
@@ -11,16 +45,23 @@ class PhysicsEngine:
     Does NOT load planetary ephemeris (DE4xx) to save space.
     """
 
-    def __init__(self, hip_csv_path: Optional[str] = None):
+    # Hipparcos catalog epoch J1991.25 expressed as a TT Julian Date
+    HIP_EPOCH_JD = 2448349.0625
+
+    def __init__(self, hip_csv_path: Optional[str] = None, subset_path: Optional[str] = DEFAULT_SUBSET_PATH):
         self.hip_dataframe = None
+        # Built-in UT1/Delta-T tables, so no download is triggered
+        self.ts = load.timescale()
         # Default path for downloaded Hipparcos data usually handled by skyfield, 
         # but we can specify a local cache.
         # For now, we will assume standard skyfield loading or local file.
         
         # We'll use a lazy load approach or load if path provided
         if hip_csv_path and os.path.exists(hip_csv_path):
-             with load.open(hip_csv_path) as f:
-                self.hip_dataframe = hipparcos.load_dataframe(f)
+            self.hip_dataframe = load_hipparcos_dataframe(hip_csv_path)
+        elif subset_path and os.path.exists(subset_path):
+            # Fall back to the generated subset so lookups work without hip_main.dat
+            self.load_subset(subset_path)
 
     def load_catalog(self, url_or_path: str = 'hip_main.dat'):
         """
@@ -30,8 +71,7 @@ class PhysicsEngine:
         try:
             # Skyfield's load() can handle local files if they match the name
             if os.path.exists(url_or_path):
-                 with load.open(url_or_path) as f:
-                    self.hip_dataframe = hipparcos.load_dataframe(f)
+                self.hip_dataframe = load_hipparcos_dataframe(url_or_path)
             else:
                 # If we were to download:
                 # with load.open(hipparcos.URL) as f: ...
@@ -40,6 +80,19 @@ class PhysicsEngine:
         except Exception as e:
             print(f"Error loading catalog: {e}")
 
+    def load_subset(self, path: str = DEFAULT_SUBSET_PATH):
+        """
+        Loads the bundled binary star subset (see src/processing/star_subset.py).
+        The resulting dataframe has the same columns and index as hipparcos.load_dataframe().
+        """
+        records = np.load(path, allow_pickle=False)
+        if records.dtype != SUBSET_DTYPE:
+            raise ValueError(f"Unexpected star subset layout in {path}")
+
+        df = pd.DataFrame({name: records[name] for name in SUBSET_DTYPE.names if name != "hip"},
+                          index=pd.Index(records["hip"].astype(np.int64), name="hip"))
+        self.hip_dataframe = df.assign(ra_hours=df["ra_degrees"] / 15.0, epoch_year=1991.25)
+
     def get_star_j2000(self, hip_id: int) -> Dict[str, float]:
         """
         Returns the J2000 RA and Dec for a given HIP ID.
@@ -66,6 +119,52 @@ class PhysicsEngine:
         except Exception as e:
             return {"error": str(e)}
 
+    def get_star_altaz(self, hip_ids: List[int], jd_values: Sequence[float], lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Returns altitude/azimuth of several stars for one observer over many dates.
+        All stars and dates are evaluated in a single vectorized pass.
+
+        Proper motion and precession-nutation are applied; aberration,
+        parallax and refraction are ignored (sub-arcminute for naked-eye work).
+        jd_values are civil (UT) Julian Days, as returned by TemporalBroker.
+        """
+        if self.hip_dataframe is None:
+            return {"error": "Catalog not loaded"}
+
+        found = [h for h in hip_ids if h in self.hip_dataframe.index]
+        missing = [h for h in hip_ids if h not in self.hip_dataframe.index]
+        t = self.ts.ut1_jd(np.atleast_1d(np.asarray(jd_values, dtype=float)))
+
+        if not found:
+            return {"hip": [], "missing": missing, "alt_degrees": np.empty((0, len(t.tt))), "az_degrees": np.empty((0, len(t.tt)))}
+
+        rows = self.hip_dataframe.loc[found]
+        ra0 = np.radians(rows["ra_degrees"].to_numpy())[:, None]
+        dec0 = np.radians(rows["dec_degrees"].to_numpy())[:, None]
+        years = (t.tt - self.HIP_EPOCH_JD) / 365.25
+        mas = np.radians(1.0 / 3.6e6)
+        dec = dec0 + rows["dec_mas_per_year"].to_numpy()[:, None] * mas * years
+        ra = ra0 + rows["ra_mas_per_year"].to_numpy()[:, None] * mas * years / np.cos(dec0)
+
+        # ICRS unit vectors (3, stars, times) rotated to the true equator of date
+        icrs = np.array([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+        x, y, z = np.einsum("ijt,jst->ist", t.M, icrs)
+        ra_date = np.arctan2(y, x)
+        dec_date = np.arcsin(np.clip(z, -1.0, 1.0))
+
+        phi = np.radians(lat)
+        hour_angle = np.radians(t.gast * 15.0 + lon) - ra_date
+        alt = np.arcsin(np.sin(phi) * np.sin(dec_date) + np.cos(phi) * np.cos(dec_date) * np.cos(hour_angle))
+        az = np.arctan2(-np.cos(dec_date) * np.sin(hour_angle),
+                        np.sin(dec_date) * np.cos(phi) - np.cos(dec_date) * np.sin(phi) * np.cos(hour_angle))
+
+        return {
+            "hip": found,
+            "missing": missing,
+            "alt_degrees": np.degrees(alt),
+            "az_degrees": np.degrees(az) % 360.0
+        }
+
 if __name__ == "__main__":
     # Test script - requires hip_main.dat typically, or we test with mock
     print("Testing Physics Engine (Star Mode)...")
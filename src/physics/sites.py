@@ -0,0 +1,40 @@
+import numpy as np
+from typing import Tuple
+
+def parse_coordinate_range(values: str) -> Tuple[float, float, float]:
+    """Parses 'start:stop:step' into floats, checking the range is finite and non-empty."""
+    start, stop, step = (float(x) for x in values.split(":"))
+    if not np.isfinite([start, stop, step]).all():
+        raise ValueError(f"Range '{values}' must be finite")
+    if step <= 0:
+        raise ValueError("Range step must be positive")
+    if stop < start:
+        raise ValueError(f"Range '{values}' stops before it starts")
+    return start, stop, step
+
+def coordinate_count(values: str) -> int:
+    """Number of values 'a,b,c' or inclusive 'start:stop:step' expands to, without building them."""
+    values = values.strip()
+    if values.count(":") == 2:
+        start, stop, step = parse_coordinate_range(values)
+        # Small tolerance so e.g. '0:1:0.1' includes its stop despite float rounding
+        return int(np.floor((stop - start) / step + 1e-9)) + 1
+    return sum(1 for x in values.split(",") if x.strip())
+
+def parse_coordinates(values: str) -> np.ndarray:
+    """Expands 'a,b,c' or inclusive 'start:stop:step'. Check coordinate_count first for large ranges."""
+    values = values.strip()
+    if values.count(":") == 2:
+        start, stop, step = parse_coordinate_range(values)
+        return start + step * np.arange(coordinate_count(values))
+    return np.array([float(x) for x in values.split(",") if x.strip()])
+
+def validate_sites(lats, lons):
+    """Raises ValueError unless every latitude is in [-90, 90] and every longitude in [-180, 180]."""
+    lats, lons = np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)
+    if not (np.isfinite(lats).all() and np.isfinite(lons).all()):
+        raise ValueError("Latitude and longitude must be finite numbers")
+    if (np.abs(lats) > 90).any():
+        raise ValueError("Latitude must be between -90 and 90 degrees")
+    if (np.abs(lons) > 180).any():
+        raise ValueError("Longitude must be between -180 and 180 degrees")
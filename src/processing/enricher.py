@@ -62,12 +62,12 @@ class LibraryEnricher:
         print(f"Saved enriched library to {output_path}")
 
 if __name__ == "__main__":
-    # Paths
-    base_dir = r"d:\Sky Cultures\sky_culture_engine"
+    # python -m src.processing.enricher
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     input_lib = os.path.join(base_dir, "data", "cultural_library.json")
     output_lib = os.path.join(base_dir, "data", "enriched_cultural_library.json")
-    # For now, pointing to a non-existent file will just result in "HIP not found" errors, which is fine for testing structure
-    hip_catalog = "hip_main.dat" 
+    # A full catalog is optional; without one PhysicsEngine uses the bundled data/hip_subset.npy
+    hip_catalog = os.getenv("HIP_CATALOG_PATH", os.path.join(base_dir, "data", "hip_main.dat"))
 
     enricher = LibraryEnricher(input_lib, hip_catalog)
     enriched = enricher.enrich()
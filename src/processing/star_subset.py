@@ -0,0 +1,77 @@
+import json
+import os
+from typing import Dict, Any, List, Set
+
+import numpy as np
+from src.physics.engine import SUBSET_DTYPE, DEFAULT_SUBSET_PATH, load_hipparcos_dataframe
+
+class StarSubsetBuilder:
+    """
+    Extracts the Hipparcos stars referenced by the cultural library from the
+    full catalog (hip_main.dat or the 2007 hip2.dat) into a small binary file
+    (data/hip_subset.npy) that PhysicsEngine loads by default.
+    """
+
+    def __init__(self, library_path: str, hip_catalog_path: str):
+        self.library_path = library_path
+        self.hip_catalog_path = hip_catalog_path
+
+    def load_library(self) -> Dict[str, Any]:
+        with open(self.library_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def referenced_hip_ids(self) -> List[int]:
+        """Every HIP ID used in constellation star lists or line polylines."""
+        hip_ids: Set[int] = set()
+        for culture_info in self.load_library().values():
+            for const in culture_info.get("constellations", []):
+                hip_ids.update(int(h) for h in const.get("stars", []))
+                for line in const.get("lines", []):
+                    # lines can be list of ints, or mixed with strings like "thin"
+                    hip_ids.update(h for h in line if isinstance(h, int))
+        return sorted(hip_ids)
+
+    def build(self) -> np.ndarray:
+        if not os.path.exists(self.hip_catalog_path):
+            raise FileNotFoundError(f"Hipparcos catalog not found: {self.hip_catalog_path}")
+
+        df = load_hipparcos_dataframe(self.hip_catalog_path)
+
+        wanted = self.referenced_hip_ids()
+        subset = df.loc[df.index.intersection(wanted)].sort_index()
+        missing = len(wanted) - len(subset)
+        print(f"Extracted {len(subset)} of {len(wanted)} referenced stars ({missing} not in catalog)")
+
+        records = np.empty(len(subset), dtype=SUBSET_DTYPE)
+        records["hip"] = subset.index.to_numpy()
+        for name in SUBSET_DTYPE.names[1:]:
+            records[name] = subset[name].to_numpy()
+        return records
+
+    def save(self, records: np.ndarray, output_path: str):
+        with open(output_path, "wb") as f:
+            np.save(f, records, allow_pickle=False)
+        print(f"Saved star subset ({os.path.getsize(output_path)} bytes) to {output_path}")
+
+def default_catalog_path(base_dir: str) -> str:
+    """
+    HIP_CATALOG_PATH if set, else data/hip_main.dat if present, else the hip2.dat
+    bundled by the optional build-time package 'hipparcos-catalog'.
+    """
+    path = os.getenv("HIP_CATALOG_PATH", os.path.join(base_dir, "data", "hip_main.dat"))
+    if os.path.exists(path) or "HIP_CATALOG_PATH" in os.environ:
+        return path
+    try:
+        import hipparcos_catalog
+    except ImportError:
+        return path
+    return str(hipparcos_catalog.catalog_path())
+
+if __name__ == "__main__":
+    # python -m src.processing.star_subset  (full catalog needed only at build time)
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    input_lib = os.path.join(base_dir, "data", "cultural_library.json")
+    hip_catalog = default_catalog_path(base_dir)
+
+    builder = StarSubsetBuilder(input_lib, hip_catalog)
+    builder.save(builder.build(), DEFAULT_SUBSET_PATH)
@@ -1,8 +1,5 @@
-import convertdate
-from convertdate import julian, mayan, gregorian
 from typing import Union, List, Tuple, Dict, Optional, Any
-import datetime
-import re
+from src.temporal import calendars
 
 class TemporalBroker:
     """
@@ -11,17 +8,18 @@ class TemporalBroker:
     """
 
     # Epoch for Egyptian Civil Calendar: Feb 26, 747 BCE (Julian) = JDN 1448638
-    EGYPTIAN_EPOCH = 1448638.0
+    EGYPTIAN_EPOCH = calendars.EGYPTIAN_EPOCH
 
     def __init__(self):
         pass
 
-    def to_jdn(self, date_input: Dict[str, Any], culture: str = "western") -> Union[float, Tuple[float, float]]:
+    def to_jdn(self, date_input: Union[Dict[str, Any], str], culture: str = "gregorian") -> Union[float, Tuple[float, float]]:
         """
         Converts a date input dictionary to JDN.
         
         Args:
-            date_input: Dictionary containing date components.
+            date_input: Dictionary containing date components, or a date string
+                        ('M:13,0,0,0,0', 'J:208,1,1', 'E:1,1,1', ISO).
                         Examples:
                         - Mayan: {"baktun": 13, "katun": 0, "tun": 0, "winal": 0, "kin": 0}
                         - Egyptian: {"year": 1, "month": 1, "day": 1}
@@ -33,71 +31,48 @@ class TemporalBroker:
             float: Single JDN for specific dates.
             Tuple[float, float]: (start_jdn, end_jdn) for ranges.
         """
-        if "start" in date_input and "end" in date_input:
+        if isinstance(date_input, dict) and "start" in date_input and "end" in date_input:
             start_jdn = self._convert_single(date_input["start"], culture)
             end_jdn = self._convert_single(date_input["end"], culture)
             return (start_jdn, end_jdn)
         
         return self._convert_single(date_input, culture)
 
-    def _convert_single(self, components: Dict[str, int], culture: str) -> float:
-        """Helper to convert a single date object."""
-        culture = culture.lower()
-        
+    def _convert_single(self, components: Union[Dict[str, int], str], culture: str) -> float:
+        """Helper to convert a single date object (component dict or prefixed/ISO string)."""
         try:
-            if culture == "mayan":
-                return mayan.to_jd(
-                    components.get("baktun", 0),
-                    components.get("katun", 0),
-                    components.get("tun", 0),
-                    components.get("winal", 0),
-                    components.get("kin", 0)
-                )
-            
-            elif culture == "egyptian":
-                return self._egyptian_to_jd(
-                    components.get("year", 1),
-                    components.get("month", 1),
-                    components.get("day", 1)
-                )
-            
-            elif culture == "julian":
-                return julian.to_jd(
-                    components.get("year", 1),
-                    components.get("month", 1),
-                    components.get("day", 1)
-                )
-                
-            elif culture == "gregorian":
-                return gregorian.to_jd(
-                    components.get("year", 1),
-                    components.get("month", 1),
-                    components.get("day", 1)
-                )
-
-            else:
-                raise ValueError(f"Unsupported culture: {culture}")
+            if isinstance(components, str):
+                self._check_string_calendar(components, culture)
+                return calendars.parse_date_string(components)
+            return calendars.components_to_jd(culture, components)
 
         except Exception as e:
             raise ValueError(f"Date conversion error for {culture} with {components}: {str(e)}")
 
-    def _egyptian_to_jd(self, year: int, month: int, day: int) -> float:
+    def _check_string_calendar(self, date_str: str, culture: str):
         """
-        Converts Egyptian Civil dates to Julian Day Number.
-        Epoch: 1 Thoth, 1 Nabonassar = Feb 26, 747 BCE (ISO -746) = JDN 1448638
+        Date strings carry their own calendar (prefix, or Gregorian for ISO).
+        Reject them when an explicit non-Gregorian culture says otherwise,
+        e.g. an ISO string with culture="julian" would silently be 13 days off.
         """
-        # (Year - 1) * 365 + (Month - 1) * 30 + (Day - 1)
-        # Note: Egyptian years are simple 365 days, no leap years.
-        if month < 1 or month > 13:
-            raise ValueError("Egyptian month must be between 1 and 13 (Epagomenal days)")
-        if day < 1 or day > 30:
-            if month == 13 and day > 5:
-                raise ValueError("Epagomenal days are only 5")
-            elif month < 13:
-                 pass # Standard limits apply but we can be lenient or strict
-        
-        days_passed = (year - 1) * 365 + (month - 1) * 30 + (day - 1)
-        return self.EGYPTIAN_EPOCH + days_passed
+        culture = calendars.get_calendar(culture).name
+        written_in = calendars.date_string_calendar(date_str)
+        if culture not in ("gregorian", written_in):
+            raise ValueError(f"Date string is {written_in}; use the '{calendars.CALENDARS[culture].prefix}:' prefix for {culture} dates")
+
+    def to_jdn_bulk(self, date_inputs: List[Union[Dict[str, Any], str]], culture: str = "gregorian") -> List[Union[float, Tuple[float, float]]]:
+        """
+        Converts many dates at once. Date strings go through the bulk parser so
+        repeated values are only parsed once.
+        """
+        if all(isinstance(d, str) for d in date_inputs):
+            try:
+                for d in set(date_inputs):
+                    self._check_string_calendar(d, culture)
+                return calendars.parse_date_strings(date_inputs)
+            except Exception as e:
+                raise ValueError(f"Date conversion error for {culture}: {str(e)}")
+        return [self.to_jdn(d, culture) for d in date_inputs]
 
 if __name__ == "__main__":
     broker = TemporalBroker()
@@ -0,0 +1,141 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, NamedTuple, Sequence, Tuple
+
+from convertdate import julian, mayan, gregorian
+
+# Epoch for Egyptian Civil Calendar: Feb 26, 747 BCE (Julian) = JDN 1448638
+EGYPTIAN_EPOCH = 1448638.0
+
+def egyptian_to_jd(year: int, month: int, day: int) -> float:
+    """
+    Converts Egyptian Civil dates to Julian Day Number.
+    Epoch: 1 Thoth, 1 Nabonassar = Feb 26, 747 BCE (ISO -746) = JDN 1448638
+    """
+    # (Year - 1) * 365 + (Month - 1) * 30 + (Day - 1)
+    # Note: Egyptian years are simple 365 days, no leap years.
+    if month < 1 or month > 13:
+        raise ValueError("Egyptian month must be between 1 and 13 (Epagomenal days)")
+    if day < 1 or day > 30:
+        if month == 13 and day > 5:
+            raise ValueError("Epagomenal days are only 5")
+        elif month < 13:
+             pass # Standard limits apply but we can be lenient or strict
+
+    days_passed = (year - 1) * 365 + (month - 1) * 30 + (day - 1)
+    return EGYPTIAN_EPOCH + days_passed
+
+class Calendar(NamedTuple):
+    """A calendar: its dict field names with defaults, string prefix and JD converter."""
+    name: str
+    fields: Tuple[Tuple[str, int], ...]
+    prefix: str
+    to_jd: Callable[..., float]
+    usage: str
+
+_YMD = (("year", 1), ("month", 1), ("day", 1))
+
+CALENDARS: Dict[str, Calendar] = {
+    cal.name: cal for cal in (
+        Calendar("mayan", (("baktun", 0), ("katun", 0), ("tun", 0), ("winal", 0), ("kin", 0)), "M", mayan.to_jd, "b,k,t,u,k"),
+        Calendar("julian", _YMD, "J", julian.to_jd, "y,m,d"),
+        Calendar("gregorian", _YMD, "G", gregorian.to_jd, "y,m,d"),
+        Calendar("egyptian", _YMD, "E", egyptian_to_jd, "y,m,d"),
+    )
+}
+_BY_PREFIX = {cal.prefix: cal for cal in CALENDARS.values()}
+
+# 'M:13,0,0,0,0', 'J:-500,3,21', ...
+_PREFIXED_RE = re.compile(r"^([A-Z]):\s*(-?\d+(?:\s*,\s*-?\d+)*)$")
+_INT_RE = re.compile(r"-?\d+")
+# ISO 8601 Gregorian, extended to signed years: '2012-12-21', '-0500-03-21T06:00', '2000-01-01T12:00:00Z'
+_ISO_RE = re.compile(
+    r"^([+-]?\d{4,6})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?)?"
+    r"(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+def get_calendar(name: str) -> Calendar:
+    cal = CALENDARS.get(name.lower())
+    if cal is None:
+        raise ValueError(f"Unsupported culture: {name}")
+    return cal
+
+@lru_cache(maxsize=4096)
+def _components_to_jd(name: str, values: Tuple[int, ...]) -> float:
+    return float(CALENDARS[name].to_jd(*values))
+
+def components_to_jd(name: str, components: Dict[str, Any]) -> float:
+    """Converts a component dict (e.g. {"year": 208, "month": 1, "day": 1}) to JD, filling defaults."""
+    cal = get_calendar(name)
+    values = tuple(int(components.get(field, default)) for field, default in cal.fields)
+    return _components_to_jd(cal.name, values)
+
+def _iso_to_jd(match: "re.Match") -> float:
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    year, month, day = int(year), int(month), int(day)
+    hour, minute, second = int(hour or 0), int(minute or 0), int(second or 0)
+
+    # convertdate does not validate, so reject out-of-range fields here
+    if not 1 <= month <= 12:
+        raise ValueError(f"month must be in 1..12, got {month}")
+    if not 1 <= day <= gregorian.month_length(year, month):
+        raise ValueError(f"day is out of range for month, got {day}")
+    if hour > 23:
+        raise ValueError(f"hour must be in 0..23, got {hour}")
+    if minute > 59 or second > 59:
+        raise ValueError("minute and second must be in 0..59")
+    if tz and tz != "Z" and (int(tz[1:3]) > 23 or int(tz[-2:]) > 59):
+        raise ValueError(f"Invalid UTC offset '{tz}'")
+
+    jd = gregorian.to_jd(year, month, day)
+    seconds = hour * 3600 + minute * 60 + second
+    if fraction:
+        seconds += int(fraction) / 10 ** len(fraction)
+    if tz and tz != "Z":
+        sign = -1 if tz[0] == "-" else 1
+        seconds -= sign * (int(tz[1:3]) * 3600 + int(tz[-2:]) * 60)
+    return jd + seconds / 86400.0
+
+def date_string_calendar(date_str: str) -> str:
+    """Returns the calendar a date string is written in ('gregorian' for ISO), without converting it."""
+    match = _PREFIXED_RE.match(date_str.strip())
+    if match and match.group(1) in _BY_PREFIX:
+        return _BY_PREFIX[match.group(1)].name
+    return "gregorian"
+
+@lru_cache(maxsize=4096)
+def parse_date_string(date_str: str) -> float:
+    """
+    Parses a date string to a (UT) Julian Day:
+    M:b,k,t,u,k -> Mayan Long Count
+    J:y,m,d -> Julian Calendar
+    G:y,m,d -> Gregorian Calendar
+    E:y,m,d -> Egyptian Civil Calendar
+    ISO -> Gregorian (time and UTC offset optional, signed years allowed)
+    """
+    date_str = date_str.strip()
+
+    match = _PREFIXED_RE.match(date_str)
+    if match:
+        cal = _BY_PREFIX.get(match.group(1))
+        if cal is None:
+            raise ValueError(f"Unknown calendar prefix '{match.group(1)}:'")
+        values = tuple(int(x) for x in _INT_RE.findall(match.group(2)))
+        if len(values) != len(cal.fields):
+            raise ValueError(f"{cal.name.capitalize()} date requires {len(cal.fields)} components ({cal.usage})")
+        return _components_to_jd(cal.name, values)
+
+    match = _ISO_RE.match(date_str)
+    if match:
+        return _iso_to_jd(match)
+
+    raise ValueError(f"Unrecognized date '{date_str}'")
+
+def parse_date_strings(date_strs: Sequence[str]) -> List[float]:
+    """Bulk form of parse_date_string; each distinct string is parsed once."""
+    parsed: Dict[str, float] = {}
+    for s in date_strs:
+        if s not in parsed:
+            parsed[s] = parse_date_string(s)
+    return [parsed[s] for s in date_strs]